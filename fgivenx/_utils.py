@@ -18,12 +18,12 @@ def _check_args(logZ, f, x, samples, weights):
 
     # logZ
     logZ = numpy.array(logZ, dtype='double')
-    if len(logZ.shape) is not 1:
+    if logZ.ndim != 1:
         raise ValueError("logZ should be a 1D array")
 
     # x
     x = numpy.array(x, dtype='double')
-    if len(x.shape) is not 1:
+    if x.ndim != 1:
         raise ValueError("x should be a 1D array")
 
     # f
@@ -41,7 +41,7 @@ def _check_args(logZ, f, x, samples, weights):
                          % (len(logZ), len(samples)))
     samples = [numpy.array(s, dtype='double') for s in samples]
     for s in samples:
-        if len(s.shape) is not 2:
+        if s.ndim != 2:
             raise ValueError("each set of samples should be a 2D array")
 
     # weights
@@ -53,7 +53,7 @@ def _check_args(logZ, f, x, samples, weights):
                for w, s in zip(weights, samples)]
 
     for w, s in zip(weights, samples):
-        if len(w.shape) is not 1:
+        if w.ndim != 1:
             raise ValueError("each set of weights should be a 1D array")
         if len(w) != len(s):
             raise ValueError("len(w) = %i != len(s) = %i" % (len(s), len(w)))
@@ -88,16 +88,19 @@ def _normalise_weights(logZ, weights, ntrim=None):
 
     Zs = numpy.exp(logZ)
 
-    weights = [w/w.sum()*Z for w, Z in zip(weights, Zs)]
+    weights = [w*(Z/w.sum()) for w, Z in zip(weights, Zs)]
 
     wmax = max([w.max() for w in weights])
 
-    weights = [w/wmax for w in weights]
-
-    ntot = sum([w.sum() for w in weights])
+    ntot = sum([w.sum() for w in weights])/wmax
 
+    # Rescale in place so that max(w) = 1, or sum(w) = ntrim when trimming
+    scale = 1/wmax
     if ntrim is not None and ntrim < ntot:
-        weights = [w*ntrim/ntot for w in weights]
+        scale *= ntrim/ntot
+
+    for w in weights:
+        w *= scale
 
     return logZ, weights
 
@@ -131,17 +134,11 @@ def _equally_weight_samples(samples, weights):
     if numpy.logical_or(weights < 0, weights > 1).any():
         raise ValueError("weights must have probability between 0 and 1")
 
-    weights = numpy.array(weights)
-    samples = numpy.array(samples)
-
-    state = numpy.random.get_state()
-
-    numpy.random.seed(1)
-    n = len(weights)
-    choices = numpy.random.rand(n) < weights
-
-    new_samples = samples[choices]
+    weights = numpy.asarray(weights)
+    samples = numpy.asarray(samples)
 
-    numpy.random.set_state(state)
+    # Use a fixed seed local generator, leaving the global state untouched
+    rng = numpy.random.default_rng(1)
+    choices = rng.random(len(weights)) < weights
 
-    return new_samples.copy()
+    return samples[choices]
@@ -294,6 +294,8 @@ def compute_samples(f, x, samples, **kwargs):
     f: function
         function :math:`f(x;\theta)` (or list of functions for each model) with
         dependent variable :math:`x`, parameterised by :math:`\theta`.
+        Functions marked with `f.vectorized = True` are evaluated on all
+        samples at once, see :func:`fgivenx.samples.compute_samples`.
 
     x: 1D array-like
         `x` values to evaluate :math:`f(x;\theta)` at.
@@ -431,7 +433,7 @@ def compute_pmf(f, x, samples, **kwargs):
     # y
     if y is not None:
         y = numpy.array(y, dtype='double')
-        if len(y.shape) is not 1:
+        if y.ndim != 1:
             raise ValueError("y should be a 1D array")
 
     fsamps = compute_samples(f, x, samples, logZ=logZ,
@@ -440,8 +442,8 @@ def compute_pmf(f, x, samples, **kwargs):
                              tqdm_kwargs=tqdm_kwargs)
 
     if y is None:
-        ymin = fsamps[~numpy.isnan(fsamps)].min(axis=None)
-        ymax = fsamps[~numpy.isnan(fsamps)].max(axis=None)
+        ymin = numpy.nanmin(fsamps)
+        ymax = numpy.nanmax(fsamps)
         y = numpy.linspace(ymin, ymax, ny)
 
     return y, fgivenx.mass.compute_pmf(fsamps, y, parallel=parallel,
@@ -1,5 +1,4 @@
 import os
-import pickle
 import numpy
 import inspect
 
@@ -43,7 +42,7 @@ class Cache(object):
     Parameters
     ----------
     file_root: str
-        cached values are saved in file_root.pkl
+        cached values are saved in file_root.npz
     """
     def __init__(self, file_root):
         self.file_root = file_root
@@ -96,15 +95,29 @@ class Cache(object):
         return data[-1]
 
     def load(self):
-        """ Load cache from file using pickle. """
+        """ Load cache from file using numpy. """
         try:
-            with open(self.file_root + '.pkl', "rb") as f:
-                return pickle.load(f)
+            data = numpy.load(self.file_root + '.npz')
         except IOError:
             raise CacheMissing(self.file_root)
 
+        with data:
+            args = []
+            while True:
+                i = len(args)
+                if '%i' % i in data.files:
+                    args.append(data['%i' % i])
+                elif 'len_%i' % i in data.files:
+                    args.append([data['%i_%i' % (i, j)]
+                                 for j in range(data['len_%i' % i])])
+                else:
+                    return args
+
     def save(self, *args):
-        """ Save cache to file using pickle.
+        """ Save cache to file using numpy.
+
+        Each argument is stored as an array, with arguments which are lists
+        of arrays stored element by element alongside their length.
 
         Parameters
         ----------
@@ -112,5 +125,12 @@ class Cache(object):
             All but the last argument are inputs to the cached function. The
             last is the actual value of the function.
         """
-        with open(self.file_root + '.pkl', "wb") as f:
-            pickle.dump(args, f, protocol=pickle.HIGHEST_PROTOCOL)
+        arrays = {}
+        for i, x in enumerate(args):
+            if isinstance(x, list):
+                arrays['len_%i' % i] = len(x)
+                for j, x_j in enumerate(x):
+                    arrays['%i_%i' % (i, j)] = x_j
+            else:
+                arrays['%i' % i] = x
+        numpy.savez(self.file_root + '.npz', **arrays)
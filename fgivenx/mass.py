@@ -1,6 +1,5 @@
 """ Utilities for computing the probability mass function. """
-import scipy.stats
-import scipy.interpolate
+import hashlib
 import numpy
 from fgivenx.parallel import parallel_apply
 from fgivenx.io import CacheException, Cache
@@ -70,52 +69,124 @@ def PMF(samples, y):
     # Remove any nans from the samples
     samples = numpy.array(samples)
     samples = samples[~numpy.isnan(samples)]
-    try:
-        # Compute the kernel density estimate
-        kernel = scipy.stats.gaussian_kde(samples)
-
-        # Add two more samples definitely outside the range and sort them
-        mn = min(samples) - 10*numpy.sqrt(kernel.covariance[0, 0])
-        mx = max(samples) + 10*numpy.sqrt(kernel.covariance[0, 0])
-        y_ = numpy.linspace(mn, mx, len(y)*10)
-
-        # Compute the probabilities at each of the extended samples
-        ps_ = kernel(y_)
-
-        # Compute the masses
-        ms = []
-        for yi in y:
-            # compute the probability at this y value
-            p = kernel(yi)
-            if p <= max(ps_)*1e-5:
-                m = 0.
-            else:
-                # Find out which samples have greater probability than P(y)
-                bools = ps_ > p
-
-                # Compute indices where to start and stop the integration
-                stops = numpy.where(numpy.logical_and(~bools[:-1], bools[1:]))
-                starts = numpy.where(numpy.logical_and(bools[:-1], ~bools[1:]))
-
-                # Compute locations
-                starts = [scipy.optimize.brentq(lambda u: kernel(u)-p,
-                                                y_[i], y_[i+1])
-                          for i in starts[0]]
-                starts = [-numpy.inf] + starts
-                stops = [scipy.optimize.brentq(lambda u: kernel(u)-p,
-                                               y_[i], y_[i+1])
-                         for i in stops[0]]
-                stops = stops + [numpy.inf]
-
-                # Sum up the masses
-                m = sum(kernel.integrate_box_1d(a, b)
-                        for a, b in zip(starts, stops))
-            ms.append(m)
-        return numpy.array(ms)
-
-    except numpy.linalg.LinAlgError:
+    y = numpy.array(y, dtype='double')
+
+    # Kernel variance from Scott's rule, as in scipy.stats.gaussian_kde
+    n = len(samples)
+    var = samples.var(ddof=1) * n**-0.4 if n > 1 else 0.
+    if not var > 0:
         return numpy.zeros_like(y)
 
+    # Define a grid extending definitely outside the range of the samples
+    mn = samples.min() - 10*numpy.sqrt(var)
+    mx = samples.max() + 10*numpy.sqrt(var)
+    y_ = numpy.linspace(mn, mx, 2**12)
+
+    # Compute the probabilities on the grid, and interpolate these to
+    # each y value rather than summing over the samples again for each
+    ps_ = _gaussian_kde_grid(samples, var, y_)
+    ps = numpy.interp(y, y_, ps_, left=0., right=0.)
+
+    # Compute the masses, discarding negligible probabilities
+    ms = _mass_below(y_, ps_, ps)
+    ms[ps <= ps_.max()*1e-5] = 0.
+    return ms
+
+
+def _gaussian_kde_grid(samples, var, y_):
+    """ Evaluate a gaussian kernel density estimate on a regular grid.
+
+    Equivalent to `scipy.stats.gaussian_kde(samples)(y_)`, but computed by
+    linearly binning the samples onto the grid and convolving with the
+    kernel using a fast Fourier transform, so the cost is
+    :math:`O(n + m\\log m)` rather than :math:`O(nm)` for :math:`n` samples
+    and :math:`m` grid points.
+
+    Parameters
+    ----------
+    samples: 1D numpy.array
+        Samples to estimate the density of. Must lie within the grid.
+
+    var: float
+        Variance of the gaussian kernel.
+
+    y_: 1D numpy.array
+        Regular grid to evaluate the density on, extending well beyond the
+        samples so that the periodic convolution does not wrap around.
+
+    Returns
+    -------
+    1D numpy.array:
+        Density evaluated at each grid point. `shape=(len(y_))`
+    """
+    m = len(y_)
+    h = (y_[-1] - y_[0])/(m - 1)
+
+    # Linearly bin the samples onto the grid
+    u = (samples - y_[0])/h
+    i = numpy.minimum(u.astype(int), m - 2)
+    w = u - i
+    counts = (numpy.bincount(i, 1 - w, minlength=m)
+              + numpy.bincount(i + 1, w, minlength=m))
+
+    # Convolve with the gaussian, whose Fourier transform is analytic
+    k = 2*numpy.pi*numpy.fft.rfftfreq(m, h)
+    ps_ = numpy.fft.irfft(numpy.fft.rfft(counts)*numpy.exp(-k**2*var/2), m)
+    return ps_/(len(samples)*h)
+
+
+def _mass_below(y_, ps_, ps):
+    """ Integrate a density over the region where it lies below each level.
+
+    The density is taken to be linear between the grid points, so that the
+    integral is exact for each level. Rather than scanning the whole grid for
+    every level, each grid cell lying wholly below a level is accounted for
+    by a cumulative sum over the cells sorted by their upper value, and only
+    the few cells straddling each level are integrated explicitly.
+
+    Parameters
+    ----------
+    y_: 1D numpy.array
+        Grid the density is evaluated on.
+
+    ps_: 1D numpy.array
+        Density evaluated on the grid `y_`.
+
+    ps: 1D numpy.array
+        Probability levels to compute the mass below.
+
+    Returns
+    -------
+    1D numpy.array:
+        Mass of the density lying below each level. `shape=(len(ps))`
+    """
+    # lower and upper density of each grid cell
+    a = numpy.minimum(ps_[:-1], ps_[1:])
+    b = numpy.maximum(ps_[:-1], ps_[1:])
+    h = numpy.diff(y_)
+
+    # Cells lying wholly below each level
+    order = numpy.argsort(b)
+    full = numpy.concatenate(([0.], numpy.cumsum((h*(a+b)/2)[order])))
+    ms = full[numpy.searchsorted(b[order], ps, side='right')]
+
+    # Cells straddling each level, a < p < b, enumerated as (cell, level)
+    # pairs. Each cell straddles a contiguous run of the sorted levels.
+    order = numpy.argsort(ps)
+    ps_sorted = ps[order]
+    lo = numpy.searchsorted(ps_sorted, a, side='right')
+    hi = numpy.searchsorted(ps_sorted, b, side='left')
+    counts = numpy.maximum(hi - lo, 0)
+    cells = numpy.repeat(numpy.arange(len(a)), counts)
+    levels = (numpy.arange(counts.sum()) + lo[cells]
+              - numpy.repeat(numpy.cumsum(counts) - counts, counts))
+
+    # Integrate the part of each straddling cell lying below its level
+    a, b, h, p = a[cells], b[cells], h[cells], ps_sorted[levels]
+    t = (p - a)/(b - a)
+    ms[order] += numpy.bincount(levels, h*t*(a+p)/2, minlength=len(ps))
+    return ms
+
 
 def compute_pmf(fsamps, y, **kwargs):
     """ Compute the pmf defined by fsamps at each x for each y.
@@ -151,9 +222,16 @@ def compute_pmf(fsamps, y, **kwargs):
         except CacheException as e:
             print(e)
 
-    masses = parallel_apply(PMF, fsamps, postcurry=(y,), parallel=parallel,
-                            tqdm_kwargs=tqdm_kwargs)
-    masses = numpy.array(masses).transpose().copy()
+    # Only compute the PMF once for each distinct set of function samples
+    fsamps = numpy.asarray(fsamps)
+    digests = numpy.array([hashlib.blake2b(fs.tobytes()).digest()
+                           for fs in fsamps])
+    _, index, inverse = numpy.unique(digests, return_index=True,
+                                     return_inverse=True)
+
+    masses = parallel_apply(PMF, fsamps[index], postcurry=(y,),
+                            parallel=parallel, tqdm_kwargs=tqdm_kwargs)
+    masses = numpy.array(masses)[inverse].transpose().copy()
 
     if cache:
         cache.save(fsamps, y, masses)
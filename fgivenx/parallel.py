@@ -33,6 +33,10 @@ def parallel_apply(f, array, **kwargs):
     f: function
         Univariate function to apply to each element of array
 
+        If `f.vectorized = True`, f is instead called once on the whole
+        array, and should return the results for each element stacked
+        along the first axis.
+
     array: array-like
         Array to apply f to
 
@@ -67,6 +71,8 @@ def parallel_apply(f, array, **kwargs):
     tqdm_kwargs = kwargs.pop('tqdm_kwargs', {})
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
+    if getattr(f, 'vectorized', False):
+        return f(*(precurry + (array,) + postcurry))
     try:
         # If running in a jupyter notebook then use tqdm_notebook.
         progress = tqdm_notebook if get_ipython().has_trait('kernel') else tqdm
@@ -83,8 +83,8 @@ def plot(x, y, z, ax=None, **kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    # Convert to sigmas
-    z = numpy.sqrt(2) * scipy.special.erfinv(1 - z)
+    # Convert to sigmas, without forming 1-z which loses small masses
+    z = numpy.sqrt(2) * scipy.special.erfcinv(z)
 
     # Gaussian filter if desired the sigmas by a factor of smooth%
     if smooth:
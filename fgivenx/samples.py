@@ -12,6 +12,15 @@ def compute_samples(f, x, samples, **kwargs):
         list of functions :math:`f(x;\theta)`  with dependent variable
         :math:`x`, parameterised by :math:`\theta`.
 
+        If a function has the attribute `f.vectorized = True`, it is called
+        once on the whole set of samples as `f(x, samples)`, and should
+        return an array of `shape=(len(samples),len(x))`.
+
+        Alternatively a function may carry a generalised ufunc with layout
+        `(p),(n)->(n)` as `f.gufunc`, e.g. one compiled with
+        :func:`numba.guvectorize` using `target='parallel'`. This is then
+        called as `f.gufunc(samples, x)`, broadcasting over the samples.
+
     x: 1D array-like
         x values to evaluate :math:`f(x;\theta)` at.
 
@@ -45,14 +54,18 @@ def compute_samples(f, x, samples, **kwargs):
         except CacheException as e:
             print(e)
 
-    fsamples = []
-    for fi, s in zip(f, samples):
+    # Fill each set of samples' columns of a single preallocated array
+    offsets = numpy.cumsum([0] + [len(s) for s in samples])
+    fsamples = numpy.empty((len(x), offsets[-1]), dtype='double')
+    for fi, s, start, end in zip(f, samples, offsets[:-1], offsets[1:]):
         if len(s) > 0:
-            fsamps = parallel_apply(fi, s, precurry=(x,), parallel=parallel,
-                                    tqdm_kwargs=tqdm_kwargs)
-            fsamps = numpy.array(fsamps).transpose().copy()
-            fsamples.append(fsamps)
-    fsamples = numpy.concatenate(fsamples, axis=1)
+            if hasattr(fi, 'gufunc'):
+                fsamps = fi.gufunc(s, x)
+            else:
+                fsamps = parallel_apply(fi, s, precurry=(x,),
+                                        parallel=parallel,
+                                        tqdm_kwargs=tqdm_kwargs)
+            fsamples[:, start:end] = numpy.transpose(fsamps)
 
     if cache:
         cache.save(x, samples, fsamples)
@@ -45,9 +45,9 @@ def test_compute_dkl():
     c_ = numpy.random.normal(e_, f_, nsamp)
     prior_fsamps = (numpy.outer(x, m_) + c_)
 
-    assert(not os.path.isfile(cache + '_dkl.pkl'))
+    assert(not os.path.isfile(cache + '_dkl.npz'))
     dkl = compute_dkl(fsamps, prior_fsamps, cache=cache)
-    assert(os.path.isfile(cache + '_dkl.pkl'))
+    assert(os.path.isfile(cache + '_dkl.npz'))
 
     dkl_ = [gaussian_dkl(a*xi+e,
                          numpy.sqrt(b**2*xi**2+f**2),
@@ -28,7 +28,7 @@ def test_Cache():
 
     # Check saving
     cache.save(data0, data1, data2)
-    assert(os.path.exists(root + '.pkl'))
+    assert(os.path.exists(root + '.npz'))
 
     # check loading
     data0_, data1_, data2_ = cache.load()
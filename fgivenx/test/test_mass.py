@@ -6,7 +6,8 @@ from numpy.testing import assert_allclose
 import scipy.stats
 import scipy.integrate
 import scipy.special
-from fgivenx.mass import PMF, compute_pmf
+from fgivenx.mass import PMF, compute_pmf, _mass_below, \
+                         _gaussian_kde_grid
 
 
 def gaussian_pmf(y, mu=0, sigma=1):
@@ -54,6 +55,25 @@ def test_PMF():
     assert_allclose(m, numpy.zeros_like(y))
 
 
+def test__gaussian_kde_grid():
+    numpy.random.seed(0)
+    samples = numpy.random.randn(1000)
+    kernel = scipy.stats.gaussian_kde(samples)
+    y_ = numpy.linspace(-10, 10, 2**12)
+    ps_ = _gaussian_kde_grid(samples, kernel.covariance[0, 0], y_)
+    assert_allclose(ps_, kernel(y_), atol=1e-5)
+
+
+def test__mass_below():
+    numpy.random.seed(0)
+    # Triangular density, for which the mass below p is p**2
+    y_ = numpy.linspace(-2, 2, 401)
+    ps_ = numpy.maximum(1-numpy.abs(y_), 0)
+    ps = numpy.random.rand(100)
+    assert_allclose(_mass_below(y_, ps_, ps), ps**2)
+    assert_allclose(_mass_below(y_, ps_, numpy.array([0., 2.])), [0, 1])
+
+
 def test_compute_pmf():
 
     with pytest.raises(TypeError):
@@ -71,9 +91,9 @@ def test_compute_pmf():
     ny = 100
     y = numpy.linspace(-3, 3, ny)
 
-    assert(not os.path.isfile(cache + '_masses.pkl'))
+    assert(not os.path.isfile(cache + '_masses.npz'))
     m = compute_pmf(fsamps, y, cache=cache)
-    assert(os.path.isfile(cache + '_masses.pkl'))
+    assert(os.path.isfile(cache + '_masses.npz'))
 
     m_ = [gaussian_pmf(y, a*xi+e, numpy.sqrt(b**2*xi**2+f**2)) for xi in x]
     assert_allclose(m.transpose(), m_, atol=3e-1)
@@ -82,3 +102,13 @@ def test_compute_pmf():
     assert_allclose(m.transpose(), m_, atol=3e-1)
 
     rmtree('.test_cache')
+
+
+def test_compute_pmf_repeated():
+    numpy.random.seed(0)
+    nsamp = 1000
+    fsamps = numpy.random.randn(3, nsamp)
+    fsamps = fsamps[[0, 1, 0, 2, 1]]
+    y = numpy.linspace(-3, 3, 10)
+    m = compute_pmf(fsamps, y)
+    assert_allclose(m.transpose(), [PMF(fs, y) for fs in fsamps])
@@ -20,3 +20,16 @@ def test_parallel_apply():
     for par in [False, True, -1, 2]:
         farray = parallel_apply(f, array, parallel=par)
         assert_allclose([f(x) for x in array], farray)
+
+
+def test_parallel_apply_vectorized():
+    array = numpy.linspace(-1, 1, 100)
+
+    def g(x):
+        assert x is array
+        return x**3
+    g.vectorized = True
+
+    for par in [False, True]:
+        farray = parallel_apply(g, array, parallel=par)
+        assert_allclose([f(x) for x in array], farray)
@@ -65,9 +65,9 @@ def test_compute_samples():
         m, c = theta
         return m*x+c
 
-    assert(not os.path.isfile(cache + '_fsamples.pkl'))
+    assert(not os.path.isfile(cache + '_fsamples.npz'))
     fsamps = compute_samples([f], x, [samples], cache=cache)
-    assert(os.path.isfile(cache + '_fsamples.pkl'))
+    assert(os.path.isfile(cache + '_fsamples.npz'))
 
     assert_allclose(fsamps_, fsamps,)
 
@@ -75,3 +75,42 @@ def test_compute_samples():
     assert_allclose(fsamps_, fsamps,)
 
     rmtree('.test_cache')
+
+
+def test_compute_samples_vectorized():
+    numpy.random.seed(0)
+    nsamp = 5000
+    m = numpy.random.normal(0, 1, nsamp)
+    c = numpy.random.normal(0, 1, nsamp)
+    samples = numpy.array([list(_) for _ in zip(m, c)])
+    nx = 100
+    x = numpy.linspace(-1, 1, nx)
+    fsamps_ = numpy.outer(x, m) + c
+
+    def f(x, theta):
+        m, c = theta.T
+        return m[:, None]*x + c[:, None]
+    f.vectorized = True
+
+    fsamps = compute_samples([f], x, [samples])
+    assert_allclose(fsamps_, fsamps)
+
+
+def test_compute_samples_gufunc():
+    numpy.random.seed(0)
+    nsamp = 5000
+    m = numpy.random.normal(0, 1, nsamp)
+    c = numpy.random.normal(0, 1, nsamp)
+    samples = numpy.array([list(_) for _ in zip(m, c)])
+    nx = 100
+    x = numpy.linspace(-1, 1, nx)
+    fsamps_ = numpy.outer(x, m) + c
+
+    def f(x, theta):
+        m, c = theta
+        return m*x+c
+    f.gufunc = numpy.vectorize(lambda theta, x: f(x, theta),
+                               signature='(p),(n)->(n)')
+
+    fsamps = compute_samples([f], x, [samples])
+    assert_allclose(fsamps_, fsamps)